@@ -3,7 +3,9 @@ Debug script to diagnose timestamp merge issue.
 Run: python debug_timestamp_merge.py
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import sys
 from pathlib import Path
 
@@ -20,14 +22,19 @@ conn = get_connection(readonly=False)
 conn.execute("DELETE FROM prices_day_ahead WHERE country IN ('ES', 'PT')")
 conn.commit()
 
+hours = pd.date_range('2022-06-15', periods=48, freq='h', tz='UTC')
+steps = np.arange(48)
+
 sample_prices = pd.DataFrame({
-    'timestamp': pd.date_range('2022-06-15', periods=48, freq='h', tz='UTC').tolist() * 2,
-    'country': ['ES'] * 48 + ['PT'] * 48,
-    'price_eur_mwh': [100 + i for i in range(48)] + [105 + i for i in range(48)],
-    'energy_mwh': [25000 + i*100 for i in range(48)] * 2
+    'timestamp': pd.DatetimeIndex(np.tile(hours.values, 2)).tz_localize('UTC'),
+    'country': np.repeat(['ES', 'PT'], 48),
+    'price_eur_mwh': np.concatenate([100 + steps, 105 + steps]),
+    'energy_mwh': np.tile(25000 + steps * 100, 2)
 })
 
-conn.execute("INSERT INTO prices_day_ahead SELECT * FROM sample_prices")
+conn.register('sample_prices_arrow', pa.Table.from_pandas(sample_prices, preserve_index=False))
+conn.execute("INSERT INTO prices_day_ahead SELECT * FROM sample_prices_arrow")
+conn.unregister('sample_prices_arrow')
 conn.commit()
 
 # Query back
@@ -40,11 +47,16 @@ panel = conn.execute("""
 
 # Create weather data
 sample_weather = pd.DataFrame({
-    'timestamp': pd.date_range('2022-06-15', periods=48, freq='h', tz='UTC'),
-    'country': ['ES'] * 48,
-    'temperature_c': [20 + i*0.5 for i in range(48)]
+    'timestamp': hours,
+    'country': 'ES',
+    'temperature_c': 20 + steps * 0.5
 })
 
+# Same category set on both sides, so the join compares int8 codes, not strings
+country_dtype = pd.CategoricalDtype(['ES', 'PT'])
+panel['country'] = panel['country'].astype(country_dtype)
+sample_weather['country'] = sample_weather['country'].astype(country_dtype)
+
 print("="*70)
 print("TIMESTAMP DIAGNOSTIC")
 print("="*70)
@@ -61,30 +73,41 @@ print(f"\n2. AFTER CONVERSION:")
 print(f"   Panel: {panel['timestamp'].dtype}")
 print(f"   Weather: {sample_weather['timestamp'].dtype}")
 
+# Raw nanoseconds since epoch - compared as plain int64 arrays below
+panel_ts_i8 = panel['timestamp'].values.view('i8')
+weather_ts_i8 = sample_weather['timestamp'].values.view('i8')
+
 print(f"\n3. FIRST 5 TIMESTAMPS FROM EACH:")
 print("\n   Panel timestamps:")
-for i, ts in enumerate(panel['timestamp'].head(5)):
-    print(f"      [{i}] {ts} | {repr(ts)} | {ts.value}")
+print(pd.DataFrame({
+    'timestamp': panel['timestamp'].head(5),
+    'ns': panel_ts_i8[:5]
+}).to_string())
 
 print("\n   Weather timestamps:")
-for i, ts in enumerate(sample_weather['timestamp'].head(5)):
-    print(f"      [{i}] {ts} | {repr(ts)} | {ts.value}")
+print(pd.DataFrame({
+    'timestamp': sample_weather['timestamp'].head(5),
+    'ns': weather_ts_i8[:5]
+}).to_string())
 
 print(f"\n4. CHECKING EQUALITY:")
-for i in range(min(5, len(panel))):
-    panel_ts = panel['timestamp'].iloc[i]
-    weather_ts = sample_weather['timestamp'].iloc[i]
-    equal = panel_ts == weather_ts
-    print(f"   [{i}] {panel_ts} == {weather_ts} ? {equal}")
-    if not equal:
-        print(f"        Difference: {panel_ts.value - weather_ts.value} nanoseconds")
+n_check = min(5, len(panel), len(sample_weather))
+diff_ns = panel_ts_i8[:n_check] - weather_ts_i8[:n_check]
+print(pd.DataFrame({
+    'panel': panel['timestamp'].array[:n_check],
+    'weather': sample_weather['timestamp'].array[:n_check],
+    'equal': diff_ns == 0,
+    'difference_ns': diff_ns
+}).to_string())
+print(f"   All equal: {np.array_equal(panel_ts_i8[:n_check], weather_ts_i8[:n_check])}")
 
 print(f"\n5. ATTEMPTING MERGE:")
-merged = panel.merge(
-    sample_weather[['timestamp', 'country', 'temperature_c']],
-    on=['timestamp', 'country'],
+# Exact-match join on the (country, timestamp) index - the same matching rule as
+# merge(on=[...]) but without re-hashing both key columns
+merged = panel.set_index(['country', 'timestamp']).join(
+    sample_weather.set_index(['country', 'timestamp'])[['temperature_c']],
     how='left'
-)
+).reset_index()
 
 print(f"   Panel shape: {panel.shape}")
 print(f"   Weather shape: {sample_weather.shape}")
@@ -95,23 +118,25 @@ print(f"\n6. ROWS WITH MISSING WEATHER:")
 missing = merged[merged['temperature_c'].isna()]
 if len(missing) > 0:
     print(f"   Found {len(missing)} rows with missing weather:")
-    for idx, row in missing.iterrows():
-        print(f"      {row['timestamp']} | Country: {row['country']}")
-        
-        # Find closest match in weather data
-        weather_ts = sample_weather['timestamp']
-        closest_idx = (weather_ts - row['timestamp']).abs().idxmin()
-        closest_ts = weather_ts.iloc[closest_idx]
-        diff = (row['timestamp'] - closest_ts).total_seconds()
-        print(f"        Closest weather timestamp: {closest_ts}")
-        print(f"        Difference: {diff} seconds")
+    
+    # Find closest match in weather data for every missing row in one sorted sweep
+    weather_ts = sample_weather[['timestamp', 'country']].assign(closest_weather=sample_weather['timestamp'])
+    nearest = pd.merge_asof(
+        missing[['timestamp', 'country']].sort_values('timestamp'),
+        weather_ts.sort_values('timestamp'),
+        on='timestamp',
+        by='country',
+        direction='nearest'
+    )
+    nearest['difference_s'] = (nearest['timestamp'] - nearest['closest_weather']).dt.total_seconds()
+    print(nearest.to_string(index=False))
 else:
     print("   No missing weather data!")
 
 print(f"\n7. UNIQUE TIMESTAMP COUNTS:")
 print(f"   Panel unique: {panel['timestamp'].nunique()}")
 print(f"   Weather unique: {sample_weather['timestamp'].nunique()}")
-print(f"   Intersection: {len(set(panel['timestamp']) & set(sample_weather['timestamp']))}")
+print(f"   Intersection: {np.intersect1d(panel_ts_i8, weather_ts_i8).size}")
 
 # Clean up
 conn.execute("DELETE FROM prices_day_ahead WHERE country IN ('ES', 'PT')")
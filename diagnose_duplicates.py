@@ -3,7 +3,7 @@ Diagnose exactly where duplicates are coming from.
 Run: python diagnose_duplicates.py
 """
 
-import pandas as pd
+import duckdb
 from pathlib import Path
 
 raw_dir = Path("data/raw/omie")
@@ -13,23 +13,48 @@ print("="*80)
 print(" DUPLICATE DIAGNOSIS")
 print("="*80)
 
-all_data = []
+# Read every file once, keeping only the columns this diagnostic needs
+duckdb.execute(f"""
+    CREATE TEMP TABLE raw AS
+    SELECT
+        regexp_replace(filename, '^.*[/\\\\]', '') AS file,
+        "DATE",
+        CONCEPT,
+        COLUMNS('^H[0-9]+$')
+    FROM read_parquet('{(raw_dir / "day_ahead_prices_*.parquet").as_posix()}',
+                      filename = true, union_by_name = true)
+""")
+
+date_ranges = {
+    file: (first, last, n_dates)
+    for file, first, last, n_dates in duckdb.sql("""
+        SELECT
+            file,
+            MIN(CAST("DATE" AS DATE)),
+            MAX(CAST("DATE" AS DATE)),
+            COUNT(DISTINCT CAST("DATE" AS DATE))
+        FROM raw
+        GROUP BY file
+    """).fetchall()
+}
+
+# Spanish price rows for October 30, 2022 (DST fall-back day)
+oct30 = duckdb.sql("""
+    SELECT *
+    FROM raw
+    WHERE CONCEPT = 'PRICE_SP' AND CAST("DATE" AS DATE) = DATE '2022-10-30'
+""").df()
 
 for file in price_files:
     print(f"\nFile: {file.name}")
-    df = pd.read_parquet(file)
-    
-    # Get date range
-    if 'DATE' in df.columns:
-        dates = pd.to_datetime(df['DATE']).dt.date
-        print(f"  Date range: {dates.min()} to {dates.max()}")
-        print(f"  Unique dates: {dates.nunique()}")
     
-    # Filter for prices
-    price_spain = df[df['CONCEPT'] == 'PRICE_SP'].copy()
+    # Get date range (files with no rows - e.g. an empty download - have no entry in date_ranges)
+    first, last, n_dates = date_ranges.get(file.name, (None, None, 0))
+    print(f"  Date range: {first} to {last}")
+    print(f"  Unique dates: {n_dates}")
     
     # Check for October 30, 2022 specifically
-    oct30_rows = price_spain[price_spain['DATE'].astype(str).str.contains('2022-10-30')]
+    oct30_rows = oct30[oct30['file'] == file.name].drop(columns='file')
     
     if len(oct30_rows) > 0:
         print(f"\n  ⚠️ Contains October 30, 2022!")
@@ -39,74 +64,75 @@ for file in price_files:
         hour_cols = [col for col in oct30_rows.columns if col.startswith('H')]
         print(f"  Hour columns: {hour_cols}")
         
-        # Show the actual data
+        # Show the actual data (missing hours dropped in one pass)
         print(f"\n  October 30, 2022 data:")
-        for col in hour_cols:
-            val = oct30_rows[col].iloc[0] if len(oct30_rows) > 0 else None
-            if pd.notna(val):
-                print(f"    {col}: {val}")
+        for col, val in oct30_rows[hour_cols].iloc[0].dropna().items():
+            print(f"    {col}: {val}")
 
 print("\n" + "="*80)
 print("Now processing all files to find duplicates...")
 print("="*80)
 
-# Process all files
-for file in price_files:
-    df = pd.read_parquet(file)
-    
-    price_spain = df[df['CONCEPT'] == 'PRICE_SP'].copy()
-    
-    long_data = []
-    
-    for _, row in price_spain.iterrows():
-        date_str = str(row['DATE'])
-        base_date = pd.Timestamp(date_str).date()
-        
-        # Only H1-H24
-        for hour_num in range(1, 25):
-            hour_col = f'H{hour_num}'
-            
-            if hour_col in row and pd.notna(row[hour_col]):
-                hour_of_day = hour_num - 1
-                timestamp = pd.Timestamp(f"{base_date} {hour_of_day:02d}:00:00", tz='UTC')
-                
-                long_data.append({
-                    'timestamp': timestamp,
-                    'country': 'ES',
-                    'price_eur_mwh': float(row[hour_col]),
-                    'file': file.name
-                })
-    
-    if long_data:
-        all_data.extend(long_data)
+# Unpivot every file in a single pass (only H1-H24)
+hour_cols = ', '.join(f'H{i}' for i in range(1, 25))
+duckdb.execute(f"""
+    CREATE TEMP TABLE combined AS
+    SELECT
+        CAST("DATE" AS DATE) + INTERVAL (CAST(substr(H, 2) AS INTEGER) - 1) HOUR AS timestamp,
+        CASE CONCEPT WHEN 'PRICE_SP' THEN 'ES' ELSE 'PT' END AS country,
+        price_eur_mwh,
+        file
+    FROM (
+        SELECT file, "DATE", CONCEPT, {hour_cols}
+        FROM raw
+        WHERE CONCEPT IN ('PRICE_SP', 'PRICE_PT')
+    )
+    UNPIVOT (price_eur_mwh FOR H IN ({hour_cols}))
+""")
 
-# Convert to DataFrame
-combined = pd.DataFrame(all_data)
-
-print(f"\nTotal rows created: {len(combined)}")
+total_rows = duckdb.sql("SELECT COUNT(*) FROM combined").fetchone()[0]
+print(f"\nTotal rows created: {total_rows}")
 
 # Find duplicates
 print("\nLooking for duplicates...")
-duplicates = combined[combined.duplicated(subset=['timestamp', 'country'], keep=False)]
+# Count per key first; only the duplicated keys get the list aggregates
+dup_groups = duckdb.sql("""
+    WITH dup_keys AS (
+        SELECT timestamp, country
+        FROM combined
+        GROUP BY timestamp, country
+        HAVING COUNT(*) > 1
+    )
+    SELECT
+        timestamp,
+        country,
+        COUNT(*) AS n,
+        list(DISTINCT file ORDER BY file) AS files,
+        list(DISTINCT price_eur_mwh ORDER BY price_eur_mwh) AS prices
+    FROM combined
+    SEMI JOIN dup_keys USING (timestamp, country)
+    GROUP BY timestamp, country
+    ORDER BY timestamp, country
+""").fetchall()
 
-if len(duplicates) > 0:
-    print(f"Found {len(duplicates)} duplicate rows\n")
-    
-    # Group by timestamp to see which timestamps are duplicated
-    dup_groups = duplicates.groupby(['timestamp', 'country'])
+if len(dup_groups) > 0:
+    print(f"Found {sum(n for _, _, n, _, _ in dup_groups)} duplicate rows\n")
     
     print("Duplicate timestamp-country pairs:")
-    for (ts, country), group in dup_groups:
+    for ts, country, n, files, prices in dup_groups:
         print(f"\n  {ts} {country}:")
-        print(f"    Appears in {len(group)} rows")
-        print(f"    From files: {group['file'].unique().tolist()}")
-        print(f"    Prices: {group['price_eur_mwh'].unique().tolist()}")
+        print(f"    Appears in {n} rows")
+        print(f"    From files: {files}")
+        print(f"    Prices: {prices}")
 else:
     print("✅ No duplicates found!")
 
 # Specifically check October 30, 2022 01:00
-oct30_01 = combined[(combined['timestamp'] == pd.Timestamp('2022-10-30 01:00:00', tz='UTC')) & 
-                     (combined['country'] == 'ES')]
+oct30_01 = duckdb.sql("""
+    SELECT *
+    FROM combined
+    WHERE timestamp = TIMESTAMP '2022-10-30 01:00:00' AND country = 'ES'
+""").df()
 
 print(f"\n" + "="*80)
 print("Specific check: 2022-10-30 01:00:00 ES")
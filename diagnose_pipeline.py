@@ -8,6 +8,7 @@ This will check every step of your data pipeline and identify issues.
 import sys
 from pathlib import Path
 import pandas as pd
+import pyarrow.parquet as pq
 
 print("="*80)
 print(" MIBEL INTELLIGENCE PROJECT - COMPREHENSIVE DIAGNOSTICS")
@@ -76,6 +77,7 @@ print(f"Python executable: {sys.executable}")
 required_packages = {
     'pandas': 'pandas',
     'numpy': 'numpy',
+    'pyarrow': 'pyarrow',
     'duckdb': 'duckdb',
     'matplotlib': 'matplotlib',
     'pytz': 'pytz',
@@ -108,10 +110,11 @@ if omie_dir.exists():
         size_mb = f.stat().st_size / (1024 * 1024)
         print(f"       - {f.name} ({size_mb:.2f} MB)")
         
-        # Check file content
+        # Check file content (footer metadata only - no data pages are decoded)
         try:
-            df = pd.read_parquet(f)
-            print(f"         Shape: {df.shape}, Columns: {list(df.columns)[:5]}...")
+            pf = pq.ParquetFile(f)
+            columns = [name for name in pf.schema_arrow.names if not name.startswith('__index_level_')]
+            print(f"         Shape: ({pf.metadata.num_rows}, {len(columns)}), Columns: {columns[:5]}...")
         except Exception as e:
             print(f"         ERROR reading file: {e}")
 else:
@@ -140,6 +143,9 @@ else:
 # ============================================================================
 section("4. DATABASE CONNECTION")
 
+# One read-only connection, reused by the schema and data checks below
+conn = None
+
 try:
     from src.utils.db_utils import get_connection
     from src.utils.db_schema import create_schema
@@ -160,8 +166,6 @@ try:
         else:
             check("Database file exists", False, "Will be created on first use")
         
-        conn.close()
-        
     except Exception as e:
         check("Can connect to DuckDB", False, str(e))
         
@@ -174,9 +178,8 @@ except ImportError as e:
 section("5. DATABASE SCHEMA")
 
 try:
-    from src.utils.db_utils import get_connection
-    
-    conn = get_connection(readonly=True)
+    if conn is None:
+        raise RuntimeError("no database connection (see section 4)")
     
     # Check if tables exist
     tables_query = """
@@ -190,11 +193,9 @@ try:
     expected_tables = ['prices_day_ahead', 'weather', 'generation', 'cross_border_flows', 'bid_curves']
     
     print(f"Tables in database: {len(tables)}")
+    present = set(tables['table_name'].tolist())
     for table in expected_tables:
-        exists = table in tables['table_name'].values
-        check(f"Table exists: {table}", exists)
-    
-    conn.close()
+        check(f"Table exists: {table}", table in present)
     
 except Exception as e:
     print(f"❌ Error checking schema: {e}")
@@ -204,52 +205,49 @@ except Exception as e:
 # ============================================================================
 section("6. DATABASE DATA")
 
+# Captured here and reused by the summary (-1 = prices table could not be queried)
+PRICE_ROW_COUNT = -1
+
 try:
-    from src.utils.db_utils import execute_query
+    if conn is None:
+        raise RuntimeError("no database connection (see section 4)")
     
-    # Check prices table
+    # Check prices table - all statistics in a single scan
     try:
-        price_count = execute_query("SELECT COUNT(*) as count FROM prices_day_ahead")
-        count = price_count['count'].iloc[0]
+        stats = conn.execute("""
+            SELECT 
+                COUNT(*) as total,
+                MIN(timestamp) as start,
+                MAX(timestamp) as end,
+                COUNT(DISTINCT country) as countries,
+                COUNT(DISTINCT DATE_TRUNC('day', timestamp)) as days,
+                SUM(CASE WHEN price_eur_mwh IS NULL THEN 1 ELSE 0 END) as null_prices
+            FROM prices_day_ahead
+        """).fetchdf()
+        count = stats['total'].iloc[0]
+        PRICE_ROW_COUNT = int(count)
         has_data = count > 0
         check(f"Prices table has data", has_data, f"{count:,} rows")
         
         if has_data:
-            # Get details
-            details = execute_query("""
-                SELECT 
-                    MIN(timestamp) as start,
-                    MAX(timestamp) as end,
-                    COUNT(DISTINCT country) as countries,
-                    COUNT(DISTINCT DATE_TRUNC('day', timestamp)) as days
-                FROM prices_day_ahead
-            """)
-            
-            print(f"     Start: {details['start'].iloc[0]}")
-            print(f"     End: {details['end'].iloc[0]}")
-            print(f"     Countries: {details['countries'].iloc[0]}")
-            print(f"     Days: {details['days'].iloc[0]}")
+            print(f"     Start: {stats['start'].iloc[0]}")
+            print(f"     End: {stats['end'].iloc[0]}")
+            print(f"     Countries: {stats['countries'].iloc[0]}")
+            print(f"     Days: {stats['days'].iloc[0]}")
             
             # Check data types
-            sample = execute_query("SELECT * FROM prices_day_ahead LIMIT 1")
+            sample = conn.execute("SELECT * FROM prices_day_ahead LIMIT 1").fetchdf()
             print(f"     Column types: {dict(sample.dtypes)}")
             
             # Check for nulls
-            null_check = execute_query("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN price_eur_mwh IS NULL THEN 1 ELSE 0 END) as null_prices
-                FROM prices_day_ahead
-            """)
-            print(f"     NULL prices: {null_check['null_prices'].iloc[0]} / {null_check['total'].iloc[0]}")
+            print(f"     NULL prices: {stats['null_prices'].iloc[0]} / {count}")
             
     except Exception as e:
         check(f"Can query prices table", False, str(e))
     
     # Check weather table
     try:
-        weather_count = execute_query("SELECT COUNT(*) as count FROM weather")
-        count = weather_count['count'].iloc[0]
+        count = conn.execute("SELECT COUNT(*) FROM weather").fetchone()[0]
         check(f"Weather table has data", count > 0, f"{count:,} rows")
     except:
         check(f"Weather table has data", False, "No data or table doesn't exist")
@@ -257,6 +255,9 @@ try:
 except Exception as e:
     print(f"❌ Error checking data: {e}")
 
+if conn is not None:
+    conn.close()
+
 # ============================================================================
 # 7. PANEL CONSTRUCTION
 # ============================================================================
@@ -274,10 +275,25 @@ if processed_dir.exists():
         
         # Check panel content
         try:
-            df = pd.read_parquet(f)
-            print(f"         Shape: {df.shape}")
-            print(f"         Columns: {list(df.columns)}")
-            print(f"         Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
+            pf = pq.ParquetFile(f)
+            columns = [name for name in pf.schema_arrow.names if not name.startswith('__index_level_')]
+            print(f"         Shape: ({pf.metadata.num_rows}, {len(columns)})")
+            print(f"         Columns: {columns}")
+            
+            # Timestamp range from the row-group statistics in the footer;
+            # only decode the column when a writer left them out
+            ts_idx = pf.schema_arrow.get_field_index('timestamp')
+            ts_stats = [pf.metadata.row_group(i).column(ts_idx).statistics
+                        for i in range(pf.metadata.num_row_groups)] if ts_idx >= 0 else []
+            if ts_stats and all(st is not None and st.has_min_max for st in ts_stats):
+                start = pd.Timestamp(min(st.min for st in ts_stats))
+                end = pd.Timestamp(max(st.max for st in ts_stats))
+            else:
+                ts = pd.read_parquet(f, columns=['timestamp'])['timestamp']
+                start, end = ts.min(), ts.max()
+            print(f"         Date range: {start} to {end}")
+            
+            df = pd.read_parquet(f, columns=['country', 'price_eur_mwh'])
             print(f"         Countries: {sorted(df['country'].unique())}")
             
             # Check for data
@@ -358,12 +374,10 @@ if not structure_ok:
 if not env_ok:
     issues.append("❌ Python packages missing - run: pip install -r requirements.txt")
 
-try:
-    price_count = execute_query("SELECT COUNT(*) as count FROM prices_day_ahead")
-    if price_count['count'].iloc[0] == 0:
-        issues.append("❌ Database is empty - need to load data")
-except:
+if PRICE_ROW_COUNT < 0:
     issues.append("❌ Cannot query database - schema may not be created")
+elif PRICE_ROW_COUNT == 0:
+    issues.append("❌ Database is empty - need to load data")
 
 if not (raw_dir / 'omie').exists() or len(list((raw_dir / 'omie').glob("*.parquet"))) == 0:
     issues.append("❌ No OMIE data downloaded")
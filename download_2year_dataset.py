@@ -11,9 +11,33 @@ Run: python download_2year_dataset.py
 """
 
 from src.data.omie_ingest import download_day_ahead_prices
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+# Chunks are downloaded concurrently, but request starts are spaced out
+# so the OMIE server never sees more than one new request every few seconds
+MAX_WORKERS = 4
+PAUSE_SECONDS = 5
+
+_rate_lock = threading.Lock()
+_last_request = 0.0
+
+
+def download_chunk(start_date, end_date, label):
+    """Download one chunk, waiting for the rate limiter before starting."""
+    global _last_request
+    with _rate_lock:
+        wait = _last_request + PAUSE_SECONDS - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request = time.monotonic()
+    
+    print(f"\nDownloading {label}: {start_date} to {end_date}")
+    return download_day_ahead_prices(start_date, end_date)
+
+
 print("="*80)
 print(" DOWNLOADING 2-YEAR IBERIAN EXCEPTION DATASET")
 print("="*80)
@@ -39,29 +63,28 @@ chunks = [
     ('2023-10-01', '2023-12-31', 'Q4 2023'),
 ]
 
-print("\nDownloading in quarterly chunks for reliability...\n")
+print(f"\nDownloading in quarterly chunks for reliability ({MAX_WORKERS} in parallel)...\n")
 
-for start_date, end_date, label in chunks:
-    print(f"\n{'='*80}")
-    print(f"Downloading {label}: {start_date} to {end_date}")
-    print(f"{'='*80}")
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    futures = {
+        executor.submit(download_chunk, start_date, end_date, label): label
+        for start_date, end_date, label in chunks
+    }
     
-    try:
-        prices = download_day_ahead_prices(start_date, end_date)
+    for future in as_completed(futures):
+        label = futures[future]
         
-        if prices is not None and len(prices) > 0:
-            print(f"✅ {label} complete: {len(prices)} rows downloaded")
-        else:
-            print(f"⚠️ {label}: No data returned (check for errors above)")
+        try:
+            prices = future.result()
             
-    except Exception as e:
-        print(f"❌ {label} failed: {e}")
-        print("Continuing with next chunk...")
-        continue
-    
-    # Brief pause between chunks
-    print("Pausing 5 seconds before next chunk...")
-    time.sleep(5)
+            if prices is not None and len(prices) > 0:
+                print(f"✅ {label} complete: {len(prices)} rows downloaded")
+            else:
+                print(f"⚠️ {label}: No data returned (check for errors above)")
+                
+        except Exception as e:
+            print(f"❌ {label} failed: {e}")
+            print("Continuing with remaining chunks...")
 
 elapsed = time.time() - start_time
 hours = int(elapsed // 3600)
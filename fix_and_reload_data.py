@@ -3,7 +3,11 @@ Fix data loading issues and reload everything correctly.
 Run: python fix_and_reload_data.py
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from pathlib import Path
 import sys
 
@@ -32,78 +36,91 @@ price_files = list(raw_dir.glob("day_ahead_prices_*.parquet"))
 
 print(f"\n2. Found {len(price_files)} OMIE files to load")
 
-all_data = []
+# Hour columns (H1 = 00:00-01:00, H2 = 01:00-02:00, etc.)
+hour_cols = [f'H{i}' for i in range(1, 25)]
+# CRITICAL: H1 = hour 0 (00:00), H2 = hour 1 (01:00), etc.
+hour_offsets = np.arange(len(hour_cols)).astype('timedelta64[h]').astype('timedelta64[ns]')
+concept_to_country = {'PRICE_SP': 'ES', 'PRICE_PT': 'PT'}
+# One fixed category set, so every file's batch shares the same dictionary
+country_dtype = pd.CategoricalDtype(list(concept_to_country.values()))
+concept_values = pa.array(list(concept_to_country))
+
+# Long-format rows from every file, kept as Arrow batches (stitched without copying)
+batch_schema = pa.schema([
+    ('timestamp', pa.timestamp('ns', tz='UTC')),
+    ('country', pa.dictionary(pa.int8(), pa.string())),
+    ('price_eur_mwh', pa.float64()),
+    ('file_idx', pa.int32()),
+])
+
+
+def to_long(chunk, file_idx):
+    """Reshape one wide batch of OMIE rows into long price rows."""
+    # Wide → long with one broadcast add: each row's date (parsed once, at day
+    # resolution) plus the 24 hour offsets gives a (rows × 24) timestamp matrix
+    prices = chunk.filter(pc.is_in(chunk['CONCEPT'], value_set=concept_values))
+    base = pd.to_datetime(prices['DATE'].to_numpy(zero_copy_only=False)).to_numpy().astype('datetime64[D]').astype('datetime64[ns]')
+    ts_matrix = base[:, None] + hour_offsets[None, :]
+    values = np.column_stack([prices[col].to_numpy(zero_copy_only=False).astype('float64') for col in hour_cols])
+    # Category codes straight from Arrow: position of each concept in concept_to_country
+    codes = pc.index_in(prices['CONCEPT'], value_set=concept_values).to_numpy(zero_copy_only=False)
+    
+    # Flatten row by row, keeping only the hours that have a price
+    has_price = ~np.isnan(values.ravel())
+    long = pd.DataFrame({
+        'timestamp': pd.DatetimeIndex(ts_matrix.ravel()[has_price]).tz_localize('UTC'),
+        'country': pd.Categorical.from_codes(np.repeat(codes, len(hour_cols))[has_price], dtype=country_dtype),
+        'price_eur_mwh': values.ravel()[has_price],
+        'file_idx': np.int32(file_idx),
+    })
+    return pa.RecordBatch.from_pandas(long[batch_schema.names], schema=batch_schema, preserve_index=False)
+
+
+batches = []
 
-for file in price_files:
+for file_idx, file in enumerate(price_files):
     print(f"\n   Processing {file.name}...")
-    df = pd.read_parquet(file)
-    
-    print(f"     Raw shape: {df.shape}")
-    print(f"     Concepts: {df['CONCEPT'].unique()}")
-    
-    # Filter for prices only
-    price_spain = df[df['CONCEPT'] == 'PRICE_SP'].copy()
-    price_portugal = df[df['CONCEPT'] == 'PRICE_PT'].copy()
+    # Stream row group sized batches, so only one batch of wide rows is in memory
+    pf = pq.ParquetFile(file)
+    print(f"     Raw shape: ({pf.metadata.num_rows}, {pf.metadata.num_columns})")
     
-    # Hour columns (H1 = 00:00-01:00, H2 = 01:00-02:00, etc.)
-    hour_cols = [f'H{i}' for i in range(1, 25)]
+    concepts = []
+    file_batches = []
+    # Only decode the columns the reshape uses (any energy columns stay on disk)
+    for chunk in pf.iter_batches(batch_size=65536, columns=['DATE', 'CONCEPT'] + hour_cols):
+        concepts += [c for c in pc.unique(chunk['CONCEPT']).to_pylist() if c not in concepts]
+        file_batches.append(to_long(chunk, file_idx))
+    print(f"     Concepts: {concepts}")
     
-    long_data = []
+    file_long = pa.Table.from_batches(file_batches, schema=batch_schema)
+    ts_range = pc.min_max(file_long['timestamp'])
+    print(f"     Transformed to {file_long.num_rows} rows")
+    print(f"     First timestamp: {ts_range['min'].as_py()}")
+    print(f"     Last timestamp: {ts_range['max'].as_py()}")
     
-    # Process Spain
-    for _, row in price_spain.iterrows():
-        date = pd.Timestamp(row['DATE'])
-        
-        for i, hour_col in enumerate(hour_cols):
-            if hour_col in row and pd.notna(row[hour_col]):
-                # CRITICAL: H1 = hour 0 (00:00), H2 = hour 1 (01:00), etc.
-                # So we use i directly, not i+1
-                timestamp = pd.Timestamp(f"{date.date()} {i:02d}:00:00", tz='UTC')
-                
-                long_data.append({
-                    'timestamp': timestamp,
-                    'country': 'ES',
-                    'price_eur_mwh': float(row[hour_col]),
-                    'energy_mwh': None
-                })
-    
-    # Process Portugal
-    for _, row in price_portugal.iterrows():
-        date = pd.Timestamp(row['DATE'])
-        
-        for i, hour_col in enumerate(hour_cols):
-            if hour_col in row and pd.notna(row[hour_col]):
-                timestamp = pd.Timestamp(f"{date.date()} {i:02d}:00:00", tz='UTC')
-                
-                long_data.append({
-                    'timestamp': timestamp,
-                    'country': 'PT',
-                    'price_eur_mwh': float(row[hour_col]),
-                    'energy_mwh': None
-                })
-    
-    df_long = pd.DataFrame(long_data)
-    all_data.append(df_long)
-    print(f"     Transformed to {len(df_long)} rows")
-    print(f"     First timestamp: {df_long['timestamp'].min()}")
-    print(f"     Last timestamp: {df_long['timestamp'].max()}")
-
-# Combine all files
-combined = pd.concat(all_data, ignore_index=True)
-
-# Remove duplicates (from overlapping files)
-print(f"\n3. Combined data: {len(combined)} rows")
-combined = combined.drop_duplicates(subset=['timestamp', 'country'])
-print(f"   After deduplication: {len(combined)} rows")
+    batches.extend(file_batches)
 
-# Sort
-combined = combined.sort_values(['country', 'timestamp']).reset_index(drop=True)
+# Remove duplicates (from overlapping files), keeping the first file's value
+combined = pa.Table.from_batches(batches, schema=batch_schema)
+print(f"\n3. Combined data: {combined.num_rows} rows")
 
-# Insert
+# Rows are written clustered by country, then time, so per-country queries
+# can skip whole row groups via DuckDB's min/max zone maps
 print(f"\n4. Inserting into database...")
-conn.execute("INSERT INTO prices_day_ahead SELECT * FROM combined")
+# DuckDB scans the Arrow buffers directly - no pandas concat, no type inference
+conn.register('combined', combined)
+conn.execute("""
+    INSERT INTO prices_day_ahead
+    SELECT DISTINCT ON (country, timestamp)
+        timestamp, country, price_eur_mwh, NULL
+    FROM combined
+    ORDER BY country, timestamp, file_idx
+""")
+conn.unregister('combined')
 conn.commit()
-print(f"   ✓ Inserted {len(combined)} rows")
+inserted = conn.execute("SELECT COUNT(*) FROM prices_day_ahead").fetchone()[0]
+print(f"   After deduplication: {inserted} rows")
+print(f"   ✓ Inserted {inserted} rows")
 
 # Verify
 print(f"\n5. Verification:")
@@ -3,7 +3,6 @@ Load OMIE data with bulletproof duplicate handling using INSERT OR REPLACE.
 Run: python fix_midnight_hour.py
 """
 
-import pandas as pd
 from pathlib import Path
 import sys
 
@@ -11,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.utils.db_utils import get_connection
 from src.utils.db_schema import create_schema
+from src.utils.omie_loader import ingest_omie
 
 print("="*80)
 print(" LOADING ALL OMIE DATA (BULLETPROOF VERSION)")
@@ -38,77 +38,27 @@ if not price_files:
 
 print(f"\n2. Found {len(price_files)} OMIE files")
 
-# Process each file and insert directly with OR REPLACE
-total_inserted = 0
+# Scan, unpivot and de-duplicate every file in one DuckDB pass, inside one
+# transaction - either every file lands or none does
+conn.begin()
+try:
+    rows_per_file, total_inserted = ingest_omie(conn, (raw_dir / "day_ahead_prices_*.parquet").as_posix())
+    conn.commit()
+except Exception as e:
+    print(f"\n[ERROR] Error: {e}")
+    import traceback
+    traceback.print_exc()
+    conn.rollback()
+    print("\n[ERROR] Load rolled back - no files were loaded")
+    conn.close()
+    sys.exit(1)
 
 for file_idx, file in enumerate(price_files, 1):
     print(f"\n   [{file_idx}/{len(price_files)}] {file.name}")
-    
-    try:
-        df = pd.read_parquet(file)
-        
-        # Filter for price rows
-        price_spain = df[df['CONCEPT'] == 'PRICE_SP'].copy()
-        price_portugal = df[df['CONCEPT'] == 'PRICE_PT'].copy()
-        
-        rows_processed = 0
-        
-        # Process Spain - insert row by row with OR REPLACE
-        for _, row in price_spain.iterrows():
-            date_str = str(row['DATE'])
-            base_date = pd.Timestamp(date_str).date()
-            
-            # Only H1-H24 (skip H25 for DST)
-            for hour_num in range(1, 25):
-                hour_col = f'H{hour_num}'
-                
-                if hour_col in row and pd.notna(row[hour_col]):
-                    hour_of_day = hour_num - 1
-                    timestamp = pd.Timestamp(f"{base_date} {hour_of_day:02d}:00:00", tz='UTC')
-                    price = float(row[hour_col])
-                    
-                    conn.execute("""
-                        INSERT OR IGNORE INTO prices_day_ahead
-                        (timestamp, country, price_eur_mwh, energy_mwh)
-                        VALUES (?, ?, ?, ?)
-                    """, [timestamp, 'ES', price, None])
-                    
-                    rows_processed += 1
-        
-        # Process Portugal
-        for _, row in price_portugal.iterrows():
-            date_str = str(row['DATE'])
-            base_date = pd.Timestamp(date_str).date()
-            
-            for hour_num in range(1, 25):
-                hour_col = f'H{hour_num}'
-                
-                if hour_col in row and pd.notna(row[hour_col]):
-                    hour_of_day = hour_num - 1
-                    timestamp = pd.Timestamp(f"{base_date} {hour_of_day:02d}:00:00", tz='UTC')
-                    price = float(row[hour_col])
-                    
-                    conn.execute("""
-                        INSERT OR IGNORE INTO prices_day_ahead
-                        (timestamp, country, price_eur_mwh, energy_mwh)
-                        VALUES (?, ?, ?, ?)
-                    """, [timestamp, 'PT', price, None])
-                    
-                    rows_processed += 1
-        
-        # Commit after each file
-        conn.commit()
-        total_inserted += rows_processed
-        
-        print(f"     [OK] Processed {rows_processed} rows")
-        
-    except Exception as e:
-        print(f"     [ERROR] Error: {e}")
-        import traceback
-        traceback.print_exc()
-        continue
-
-print(f"\n3. Total operations: {total_inserted:,}")
+    print(f"     [OK] Staged {rows_per_file.get(file.name, 0)} rows")
+
+print(f"\n3. Total rows staged: {sum(rows_per_file.values()):,}")
+print(f"   Total rows inserted: {total_inserted:,} (overlaps removed)")
 
 # Verify final count
 print(f"\n4. Verification:")
@@ -118,14 +68,15 @@ result = conn.execute("""
         MIN(timestamp) as start,
         MAX(timestamp) as end,
         COUNT(DISTINCT country) as countries,
-        COUNT(DISTINCT DATE_TRUNC('day', timestamp)) as days
+        -- Calendar span from the min/max, no hash-distinct over every row
+        COALESCE(CAST(MAX(timestamp) AS DATE) - CAST(MIN(timestamp) AS DATE) + 1, 0) as days
     FROM prices_day_ahead
 """).fetchdf()
 
 print(f"   Rows in database: {result['count'].iloc[0]:,}")
 print(f"   Date range: {result['start'].iloc[0]} to {result['end'].iloc[0]}")
 print(f"   Countries: {result['countries'].iloc[0]}")
-print(f"   Days: {result['days'].iloc[0]}")
+print(f"   Days spanned: {result['days'].iloc[0]}")
 
 # Check for any remaining duplicates (shouldn't be any)
 dups = conn.execute("""
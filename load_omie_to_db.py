@@ -3,10 +3,10 @@ Load downloaded OMIE data into DuckDB.
 Run: python load_omie_to_db.py
 """
 
-import pandas as pd
 from pathlib import Path
 from src.utils.db_utils import get_connection
 from src.utils.db_schema import create_schema
+from src.utils.omie_loader import ingest_omie, summarize_omie
 
 print("="*70)
 print("LOADING OMIE DATA INTO DATABASE")
@@ -35,94 +35,46 @@ if not price_files:
 
 print(f"\n2. Found {len(price_files)} price files")
 
-total_rows = 0
+pattern = (raw_dir / "day_ahead_prices_*.parquet").as_posix()
 
+# Per-file diagnostics first (only the CONCEPT column is decoded)
+summary = summarize_omie(conn, pattern)
 for file in price_files:
-    print(f"\n   Loading {file.name}...")
-    df = pd.read_parquet(file)
-    
-    print(f"      Raw shape: {df.shape}")
-    print(f"      Unique concepts: {df['CONCEPT'].unique() if 'CONCEPT' in df.columns else 'N/A'}")
-    
-    # Filter for price rows only
-    price_spain = df[df['CONCEPT'] == 'PRICE_SP'].copy()
-    price_portugal = df[df['CONCEPT'] == 'PRICE_PT'].copy()
-    
-    print(f"      Spain price rows: {len(price_spain)}")
-    print(f"      Portugal price rows: {len(price_portugal)}")
-    
-    if len(price_spain) == 0 and len(price_portugal) == 0:
-        print("      ⚠️ No price data found, skipping...")
-        continue
-    
-    # Get hour columns (H1, H2, ... H24, excluding H25 which is DST overflow)
-    hour_cols = [f'H{i}' for i in range(1, 25)]
-    
-    # Transform Spain prices
-    long_data = []
-    
-    for _, row in price_spain.iterrows():
-        date = pd.Timestamp(row['DATE'])
-        
-        for i, hour_col in enumerate(hour_cols):
-            if hour_col in row and pd.notna(row[hour_col]):
-                timestamp = date + pd.Timedelta(hours=i)
-                timestamp = timestamp.tz_localize('UTC')
-                
-                long_data.append({
-                    'timestamp': timestamp,
-                    'country': 'ES',
-                    'price_eur_mwh': float(row[hour_col]),
-                    'energy_mwh': None
-                })
-    
-    # Transform Portugal prices
-    for _, row in price_portugal.iterrows():
-        date = pd.Timestamp(row['DATE'])
-        
-        for i, hour_col in enumerate(hour_cols):
-            if hour_col in row and pd.notna(row[hour_col]):
-                timestamp = date + pd.Timedelta(hours=i)
-                timestamp = timestamp.tz_localize('UTC')
-                
-                long_data.append({
-                    'timestamp': timestamp,
-                    'country': 'PT',
-                    'price_eur_mwh': float(row[hour_col]),
-                    'energy_mwh': None
-                })
-    
-    df_long = pd.DataFrame(long_data)
-    
-    print(f"      Transformed to {len(df_long):,} rows")
-    
-    if len(df_long) > 0:
-        # Show sample
-        print(f"      Sample transformed data:")
-        print(df_long.head(3))
-        
-        # Check for NaN prices
-        nan_prices = df_long['price_eur_mwh'].isna().sum()
-        if nan_prices > 0:
-            print(f"      ⚠️ Found {nan_prices} NaN prices, dropping...")
-            df_long = df_long[df_long['price_eur_mwh'].notna()]
-        
-        # Insert - duplicates will be skipped
-        try:
-            conn.execute("INSERT OR IGNORE INTO prices_day_ahead SELECT * FROM df_long")
-            conn.commit()
-            
-            # Count actual inserts (difficult to get exact count with OR IGNORE)
-            total_rows += len(df_long)
-            print(f"      ✓ Processed {len(df_long):,} rows (duplicates ignored)")
-            
-        except Exception as e:
-            print(f"      ❌ Insert failed: {e}")
-            raise
+    print(f"\n   {file.name}:")
+    info = summary.get(file.name, {'raw_rows': 0, 'concepts': [], 'price_rows': {}})
+    print(f"      Raw rows: {info['raw_rows']}")
+    print(f"      Unique concepts: {info['concepts']}")
+    print(f"      Spain price rows: {info['price_rows'].get('ES', 0)}")
+    print(f"      Portugal price rows: {info['price_rows'].get('PT', 0)}")
+    if not any(info['price_rows'].values()):
+        print("      ⚠️ No price data found, will be skipped")
+
+# One DuckDB scan over every file, one transaction - duplicates will be skipped
+print(f"\n   Loading {len(price_files)} files in one pass...")
+conn.begin()
+try:
+    rows_per_file, total_rows = ingest_omie(conn, pattern)
+except Exception as e:
+    print(f"\n   ❌ Insert failed: {e}")
+    conn.rollback()
+    raise
+conn.commit()
+
+# Post-load summary: hourly price rows read from each file (before de-duplication)
+for file in price_files:
+    if rows_per_file.get(file.name, 0) > 0:
+        print(f"      ✓ {file.name}: {rows_per_file[file.name]:,} price rows read")
 
 print(f"\n3. Loading complete!")
 print(f"   Total rows loaded: {total_rows:,}")
 
+print(f"\n   Sample loaded data:")
+print(conn.execute("""
+    SELECT * FROM prices_day_ahead
+    ORDER BY timestamp, country
+    LIMIT 3
+""").fetchdf())
+
 # Verify
 result = conn.execute("""
     SELECT 
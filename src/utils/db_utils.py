@@ -6,19 +6,38 @@ to avoid multiple connections to the same file (causes locking issues).
 """
 
 import duckdb
+import re
 from pathlib import Path
 from typing import Optional
 
 # Database file location
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "mibel.duckdb"
 
+# Accepted memory_limit values: a number and a unit, e.g. '4GB', '512 MiB'
+_MEMORY_LIMIT_PATTERN = re.compile(r'\d+(\.\d+)?\s*[KMGT]i?B', re.IGNORECASE)
 
-def get_connection(readonly: bool = False) -> duckdb.DuckDBPyConnection:
+
+def get_connection(readonly: bool = False,
+                   threads: Optional[int] = None,
+                   memory_limit: Optional[str] = None,
+                   preserve_insertion_order: bool = True) -> duckdb.DuckDBPyConnection:
     """
     Get a connection to the DuckDB database.
     
+    The tuning options are opt-in: no script in the repo sets them, and
+    the defaults already use every core. Pass them only when a run needs a
+    memory cap or doesn't care about insertion order.
+    
     Args:
         readonly: If True, open in read-only mode (prevents accidental modifications)
+        threads: Worker threads for parquet scans, joins and inserts
+                 (None = DuckDB default, one per core)
+        memory_limit: Memory cap before DuckDB spills to disk, e.g. '4GB'
+                      (None = DuckDB default, 80% of RAM). Raises ValueError
+                      if it isn't a number followed by KB/MB/GB/TB (or KiB...)
+        preserve_insertion_order: Set False for bulk writes whose row order
+                                  doesn't matter - lets DuckDB pipeline freely.
+                                  Keep True when relying on INSERT ... ORDER BY
     
     Returns:
         DuckDB connection object
@@ -27,14 +46,32 @@ def get_connection(readonly: bool = False) -> duckdb.DuckDBPyConnection:
         conn = get_connection()
         conn.execute("SELECT * FROM prices LIMIT 10").fetchdf()
     """
+    # Checked here because the value ends up inside a SET statement
+    if memory_limit is not None and not _MEMORY_LIMIT_PATTERN.fullmatch(memory_limit):
+        raise ValueError(f"Invalid memory_limit {memory_limit!r}, expected e.g. '4GB'")
+    
     # Ensure data directory exists
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     
     # DuckDB automatically creates the database file if it doesn't exist
-    return duckdb.connect(str(DB_PATH), read_only=readonly)
+    conn = duckdb.connect(str(DB_PATH), read_only=readonly)
+    
+    # Applied with SET rather than connect(config=...) - DuckDB refuses a second
+    # connection to the same file if its config differs from the open one.
+    # SET is database-wide: other open connections to the file see it too
+    if threads is not None:
+        conn.execute(f"SET threads = {int(threads)}")
+    if memory_limit is not None:
+        conn.execute(f"SET memory_limit = '{memory_limit}'")
+    if not preserve_insertion_order:
+        conn.execute("SET preserve_insertion_order = false")
+    
+    return conn
 
 
-def execute_query(query: str, readonly: bool = True) -> any:
+def execute_query(query: str, readonly: bool = True,
+                  conn: Optional[duckdb.DuckDBPyConnection] = None,
+                  params: Optional[list] = None) -> any:
     """
     Execute a query and return results as pandas DataFrame.
     
@@ -44,41 +81,70 @@ def execute_query(query: str, readonly: bool = True) -> any:
     Args:
         query: SQL query string
         readonly: Open database in read-only mode
+        conn: Already-open connection to run on instead of opening the file
+              again (left open; `readonly` is ignored)
+        params: Values for `?` placeholders in the query - never format
+                values into the SQL string
     
     Returns:
         Query results as pandas DataFrame
     """
+    if conn is not None:
+        return conn.execute(query, params).fetchdf()
+    
     with get_connection(readonly=readonly) as conn:
-        return conn.execute(query).fetchdf()
+        return conn.execute(query, params).fetchdf()
 
 
-def table_exists(table_name: str) -> bool:
-    """Check if a table exists in the database."""
-    query = f"""
+def _quote_identifier(name: str) -> str:
+    """Quote a table name for SQL (identifiers can't be bound as parameters)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table_exists(table_name: str,
+                 conn: Optional[duckdb.DuckDBPyConnection] = None) -> bool:
+    """Check if a table exists in the database (optionally on an open connection)."""
+    query = """
         SELECT COUNT(*) as count 
         FROM information_schema.tables 
-        WHERE table_name = '{table_name}'
+        WHERE table_name = ?
     """
-    result = execute_query(query)
+    result = execute_query(query, conn=conn, params=[table_name])
     return result['count'].iloc[0] > 0
 
 
-def get_table_info(table_name: str) -> any:
+def get_table_info(table_name: str,
+                   conn: Optional[duckdb.DuckDBPyConnection] = None) -> any:
     """
     Get information about a table's structure and size.
     
     Returns:
         DataFrame with columns: column_name, data_type, null_count
     """
-    if not table_exists(table_name):
+    if conn is None:
+        # One connection for both the existence check and the DESCRIBE
+        with get_connection(readonly=True) as conn:
+            return get_table_info(table_name, conn=conn)
+    
+    if not table_exists(table_name, conn=conn):
         raise ValueError(f"Table '{table_name}' does not exist")
     
-    query = f"DESCRIBE {table_name}"
-    return execute_query(query)
+    query = f"DESCRIBE {_quote_identifier(table_name)}"
+    return execute_query(query, conn=conn)
 
 
-def get_row_count(table_name: str) -> int:
-    """Get number of rows in a table."""
-    query = f"SELECT COUNT(*) as count FROM {table_name}"
-    result = execute_query(query)
-    return int(result['count'].iloc[0])
\ No newline at end of file
+def get_row_count(table_name: str,
+                  conn: Optional[duckdb.DuckDBPyConnection] = None) -> int:
+    """Get number of rows in a table (optionally on an open connection)."""
+    if conn is None:
+        # One connection for both the existence check and the count
+        with get_connection(readonly=True) as conn:
+            return get_row_count(table_name, conn=conn)
+    
+    # Only names that are real tables ever reach the SQL text
+    if not table_exists(table_name, conn=conn):
+        raise ValueError(f"Table '{table_name}' does not exist")
+    
+    query = f"SELECT COUNT(*) as count FROM {_quote_identifier(table_name)}"
+    result = execute_query(query, conn=conn)
+    return int(result['count'].iloc[0])
@@ -0,0 +1,130 @@
+"""
+Load OMIE day-ahead price files into DuckDB.
+
+Why a shared loader? fix_midnight_hour.py and load_omie_to_db.py used to
+walk the raw files one by one with their own copy of the same wide → long
+transform. Here every file is read by a single DuckDB parquet scan (spread
+across threads by row group) and reshaped in SQL, so no row ever passes
+through pandas.
+
+OMIE files are wide: one row per (DATE, CONCEPT) with hourly columns
+H1..H24 (H1 = 00:00-01:00) plus H25 on the 25-hour DST day, which is skipped.
+"""
+
+from typing import Dict, Tuple
+
+import duckdb
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Hourly price columns loaded from every file (H25 is the DST overflow hour)
+HOUR_COLUMNS = [f'H{i}' for i in range(1, 25)]
+
+# OMIE concept → country code in prices_day_ahead
+CONCEPT_TO_COUNTRY = {'PRICE_SP': 'ES', 'PRICE_PT': 'PT'}
+
+
+def summarize_omie(conn: duckdb.DuckDBPyConnection,
+                   glob_pattern: str) -> Dict[str, dict]:
+    """
+    Summarize every OMIE file matching a glob before it is loaded.
+    
+    Only the CONCEPT column is decoded, so this is cheap next to the load.
+    Files with no rows at all are missing from the result.
+    
+    Args:
+        conn: DuckDB connection
+        glob_pattern: Parquet path glob, e.g. 'data/raw/omie/day_ahead_prices_*.parquet'
+    
+    Returns:
+        File name → {'raw_rows': int, 'concepts': [str, ...],
+                     'price_rows': {country code: rows of that price concept}}
+    
+    Example:
+        summary = summarize_omie(conn, 'data/raw/omie/day_ahead_prices_*.parquet')
+        summary['day_ahead_prices_2022.parquet']['price_rows']['ES']
+    """
+    pattern = glob_pattern.replace("'", "''")
+    price_counts = ', '.join(
+        f"COUNT(*) FILTER (WHERE CONCEPT = '{concept}')" for concept in CONCEPT_TO_COUNTRY
+    )
+    
+    rows = conn.execute(f"""
+        SELECT
+            regexp_replace(filename, '^.*[/\\\\]', '') AS file,
+            COUNT(*),
+            list(DISTINCT CONCEPT ORDER BY CONCEPT),
+            {price_counts}
+        FROM read_parquet('{pattern}', filename = true, union_by_name = true)
+        GROUP BY file
+    """).fetchall()
+    
+    return {
+        file: {
+            'raw_rows': raw_rows,
+            'concepts': concepts,
+            'price_rows': dict(zip(CONCEPT_TO_COUNTRY.values(), counts)),
+        }
+        for file, raw_rows, concepts, *counts in rows
+    }
+
+
+def ingest_omie(conn: duckdb.DuckDBPyConnection,
+                glob_pattern: str) -> Tuple[Dict[str, int], int]:
+    """
+    Load every OMIE price file matching a glob into prices_day_ahead.
+
+    Overlapping files are de-duplicated in one sorted pass: the first file
+    in filename order keeps each (timestamp, country), and rows already in
+    the table are never replaced (INSERT OR IGNORE).
+
+    Args:
+        conn: Writable DuckDB connection (the caller owns the transaction)
+        glob_pattern: Parquet path glob, e.g. 'data/raw/omie/day_ahead_prices_*.parquet'
+
+    Returns:
+        (price rows read per file name, rows inserted into prices_day_ahead)
+
+    Example:
+        rows_per_file, inserted = ingest_omie(conn, 'data/raw/omie/day_ahead_prices_*.parquet')
+    """
+    hour_cols = ', '.join(HOUR_COLUMNS)
+    concepts = ', '.join(f"'{concept}'" for concept in CONCEPT_TO_COUNTRY)
+    country = ' '.join(f"WHEN '{concept}' THEN '{code}'" for concept, code in CONCEPT_TO_COUNTRY.items())
+    pattern = glob_pattern.replace("'", "''")
+
+    # Filter, unpivot (NULL hours are dropped) and stage all files at once
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE omie_stage AS
+        SELECT
+            regexp_replace(filename, '^.*[/\\\\]', '') AS file,
+            CAST("DATE" AS DATE) + INTERVAL (CAST(substr(H, 2) AS INTEGER) - 1) HOUR AS timestamp,
+            CASE CONCEPT {country} END AS country,
+            price_eur_mwh
+        FROM (
+            SELECT filename, "DATE", CONCEPT, {hour_cols}
+            FROM read_parquet('{pattern}', filename = true, union_by_name = true)
+            WHERE CONCEPT IN ({concepts})
+        )
+        UNPIVOT (price_eur_mwh FOR H IN ({hour_cols}))
+    """)
+
+    rows_per_file = dict(conn.execute("""
+        SELECT file, COUNT(*)
+        FROM omie_stage
+        GROUP BY file
+    """).fetchall())
+
+    # One insert in primary-key order, so the key index is built in sequence
+    inserted = conn.execute("""
+        INSERT OR IGNORE INTO prices_day_ahead
+        SELECT DISTINCT ON (timestamp, country)
+            timestamp, country, price_eur_mwh, NULL AS energy_mwh
+        FROM omie_stage
+        ORDER BY timestamp, country, file
+    """).fetchone()[0]
+    conn.execute("DROP TABLE omie_stage")
+
+    logger.info(f"Loaded {inserted:,} OMIE price rows from {len(rows_per_file)} files")
+    return rows_per_file, inserted
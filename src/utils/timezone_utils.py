@@ -10,6 +10,7 @@ THE TIMEZONE NIGHTMARE:
 This module provides utilities to handle these edge cases correctly.
 """
 
+import numpy as np
 import pandas as pd
 import pytz
 from datetime import datetime, timedelta
@@ -31,9 +32,11 @@ def normalize_to_utc(df: pd.DataFrame, timestamp_col: str = 'timestamp') -> pd.D
         timestamp_col: Name of timestamp column
     
     Returns:
-        DataFrame with UTC timestamps (using pytz.UTC)
+        DataFrame with UTC timestamps (using pytz.UTC). The input is not
+        modified; other columns are shared with it, not copied
     """
-    df = df.copy()
+    # Shallow copy: only the timestamp column is replaced below
+    df = df.copy(deep=False)
     
     # Check if timestamp is timezone-aware
     if df[timestamp_col].dt.tz is None:
@@ -66,11 +69,10 @@ def handle_dst_transitions(df: pd.DataFrame,
         timestamp_col: Name of timestamp column
     
     Returns:
-        DataFrame (validated, may have rows removed if duplicates found)
+        DataFrame (validated, may have rows removed if duplicates found).
+        The input is not modified
     """
-    df = df.copy()
-    
-    # Sort by timestamp
+    # Sort by timestamp (returns a new DataFrame, so no up-front copy)
     df = df.sort_values(timestamp_col).reset_index(drop=True)
     
     # Check for gaps
@@ -142,29 +144,46 @@ def add_time_features(df: pd.DataFrame,
     - Grouping (e.g., average price by hour)
     - Regression features
     - Identifying patterns
-    """
-    df = df.copy()
     
-    # Extract time components
-    df['hour'] = df[timestamp_col].dt.hour
-    df['day_of_week'] = df[timestamp_col].dt.dayofweek
-    df['month'] = df[timestamp_col].dt.month
-    df['year'] = df[timestamp_col].dt.year
-    df['quarter'] = df[timestamp_col].dt.quarter
-    df['day_of_year'] = df[timestamp_col].dt.dayofyear
+    The input is not modified: the features are added to a shallow copy,
+    so the existing columns are shared with it rather than duplicated.
+    """
+    df = df.copy(deep=False)
+    
+    # Extract time components from one datetime64 array of wall-clock times
+    # (in the column's own timezone, as .dt would report them)
+    ts = pd.DatetimeIndex(df[timestamp_col])
+    wall = (ts.tz_localize(None) if ts.tz is not None else ts).to_numpy()
+    days = wall.astype('datetime64[D]')
+    months = wall.astype('datetime64[M]').astype('int64')
+    
+    fields = {
+        'hour': (wall - days).astype('timedelta64[h]').astype('int32'),
+        'day_of_week': ((days.astype('int64') + 3) % 7).astype('int32'),  # 1970-01-01 was a Thursday
+        'month': (months % 12 + 1).astype('int32'),
+        'year': (months // 12 + 1970).astype('int32'),
+        'quarter': (months % 12 // 3 + 1).astype('int32'),
+        'day_of_year': ((days - wall.astype('datetime64[Y]').astype('datetime64[D]'))
+                        .astype('int64') + 1).astype('int32'),
+    }
+    if ts.hasnans:
+        # Missing timestamps give NaN features, like the .dt accessors
+        fields = {name: np.where(ts.isna(), np.nan, values) for name, values in fields.items()}
+    
+    for name, values in fields.items():
+        df[name] = values
     
     # Boolean features
-    df['is_weekend'] = df['day_of_week'].isin([5, 6])  # Saturday, Sunday
+    df['is_weekend'] = fields['day_of_week'] >= 5  # Saturday, Sunday (NaN compares False)
     
     # Time periods for analysis
     # Iberian Exception: June 15, 2022 to December 31, 2023
-    iberian_start = pd.Timestamp('2022-06-15', tz=UTC)
-    iberian_end = pd.Timestamp('2023-12-31 23:59:59', tz=UTC)
+    # (compared as UTC instants on the same array; NaT compares False)
+    iberian_start = np.datetime64('2022-06-15T00:00:00')
+    iberian_end = np.datetime64('2023-12-31T23:59:59')
     
-    df['is_iberian_exception'] = (
-        (df[timestamp_col] >= iberian_start) & 
-        (df[timestamp_col] <= iberian_end)
-    )
+    instants = (ts.tz_convert(None) if ts.tz is not None else ts).to_numpy()
+    df['is_iberian_exception'] = (instants >= iberian_start) & (instants <= iberian_end)
     
     return df
 
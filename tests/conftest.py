@@ -0,0 +1,40 @@
+"""
+Shared pytest fixtures.
+
+Why a shared connection? Every get_connection() opens the database file
+and loads its catalog again, and a read-only connection can't be opened
+while a writable one to the same file is still around. The database tests
+share one writable connection for the whole run instead, and the schema
+DDL runs once before them.
+
+The database tests never touch data/mibel.duckdb: the fixtures point
+db_utils.DB_PATH at a throwaway file, and only tests that ask for db_conn
+create it. Pure unit tests need no database at all.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils import db_utils
+from src.utils.db_utils import get_connection
+from src.utils.db_schema import create_schema
+
+
+@pytest.fixture(scope="session")
+def _schema(tmp_path_factory):
+    """Create the schema once per run, in a temporary database file."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(db_utils, 'DB_PATH', tmp_path_factory.mktemp('db') / 'mibel.duckdb')
+        create_schema()
+        yield db_utils.DB_PATH
+
+
+@pytest.fixture(scope="session")
+def db_conn(_schema):
+    """One read/write connection to the test database, closed after the last test."""
+    conn = get_connection(readonly=False)
+    yield conn
+    conn.close()
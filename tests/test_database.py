@@ -9,27 +9,24 @@ from pathlib import Path
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.utils.db_utils import get_connection, table_exists
+from src.utils import db_utils
+from src.utils.db_utils import get_connection, table_exists, get_row_count
 from src.utils.db_schema import create_schema
 
-def test_database_connection():
+def test_database_connection(db_conn):
     """Test that we can create and connect to DuckDB."""
     
     print("Testing database connection...")
     
     try:
-        # Get connection
-        conn = get_connection(readonly=False)
-        
         # Test simple query
-        result = conn.execute("SELECT 42 as answer").fetchdf()
+        answer = db_conn.execute("SELECT 42 as answer").fetchone()[0]
         
-        assert result['answer'].iloc[0] == 42, "Query returned wrong result"
+        assert answer == 42, "Query returned wrong result"
         
         print("  ✓ Database connection works")
-        print(f"  ✓ Database file: {Path('data/mibel.duckdb').absolute()}")
+        print(f"  ✓ Database file: {db_utils.DB_PATH.absolute()}")
         
-        conn.close()
         return True
         
     except Exception as e:
@@ -37,17 +34,13 @@ def test_database_connection():
         return False
 
 
-def test_schema_creation():
+def test_schema_creation(db_conn):
     """Test that we can create tables."""
     
     print("\nTesting schema creation...")
     
     try:
-        # Create schema
-        create_schema()
-        print("  ✓ Schema created")
-        
-        # Check that tables exist
+        # Schema is created once per run (see conftest.py) - check that tables exist
         expected_tables = [
             'prices_day_ahead',
             'generation',
@@ -56,28 +49,71 @@ def test_schema_creation():
             'bid_curves'
         ]
         
-        conn = get_connection(readonly=True)
+        # One catalog query for all tables (a cursor shares the open database)
+        cursor = db_conn.cursor()
+        present = {name for (name,) in cursor.execute("""
+            SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'
+        """).fetchall()}
+        cursor.close()
         
         for table in expected_tables:
-            if table_exists(table):
+            if table in present:
                 print(f"  ✓ Table '{table}' exists")
             else:
                 print(f"  ✗ Table '{table}' missing")
-                return False
         
-        conn.close()
-        return True
+        return all(table in present for table in expected_tables)
         
     except Exception as e:
         print(f"  ✗ Schema creation failed: {e}")
         return False
 
 
+def test_table_name_is_not_sql(db_conn):
+    """Test that table names are looked up, never run as SQL."""
+    
+    print("\nTesting table-name handling...")
+    
+    # A quoted predicate must not turn the lookup into "any table exists"
+    assert not table_exists("x' OR '1'='1", conn=db_conn), "table_exists evaluated injected SQL"
+    
+    try:
+        get_row_count("prices_day_ahead; DROP TABLE prices_day_ahead", conn=db_conn)
+        assert False, "get_row_count accepted a name that is not a table"
+    except ValueError:
+        pass
+    
+    assert table_exists('prices_day_ahead', conn=db_conn), "prices_day_ahead was dropped"
+    
+    print("  ✓ Table names are treated as values")
+    return True
+
+
+def test_memory_limit_is_checked():
+    """Test that memory_limit must be a size before it reaches SQL."""
+    
+    print("\nTesting memory_limit validation...")
+    
+    for bad in ["4GB'; DROP TABLE prices_day_ahead; --", "lots", "4GB\n"]:
+        try:
+            get_connection(memory_limit=bad)
+            assert False, f"get_connection accepted memory_limit={bad!r}"
+        except ValueError:
+            pass
+    
+    print("  ✓ Only sizes like '4GB' are accepted")
+    return True
+
+
 if __name__ == "__main__":
-    success = test_database_connection()
+    create_schema()
+    conn = get_connection(readonly=False)
+    success = test_database_connection(conn)
     
     if success:
-        success = test_schema_creation()
+        success = test_schema_creation(conn)
+    
+    conn.close()
     
     if success:
         print("\n✅ Database tests passed!")
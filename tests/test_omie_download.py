@@ -4,6 +4,7 @@ Run: python tests/test_omie_download.py
 """
 
 import sys
+import textwrap
 from pathlib import Path
 import pandas as pd
 
@@ -41,7 +42,7 @@ def test_omie_prices_download():
         print(f"  ✓ Columns: {list(df.columns)}")
         
         print(f"\nFirst few rows:")
-        print(df.head())
+        print(df.head().to_csv(index=False), end="")
         
         # Extract Spanish prices to validate
         spain_prices = df[df['CONCEPT'] == 'PRICE_SP']
@@ -53,23 +54,23 @@ def test_omie_prices_download():
             price_cols = [col for col in spain_prices.columns if col.startswith('H') and len(col) <= 3]
             prices = spain_prices[price_cols].iloc[0].dropna()
             
+            stats = prices.agg(['min', 'max', 'mean'])
             print(f"\n  Price statistics for {spain_prices['DATE'].iloc[0]}:")
-            print(f"    Min: {prices.min():.2f} EUR/MWh")
-            print(f"    Max: {prices.max():.2f} EUR/MWh")
-            print(f"    Avg: {prices.mean():.2f} EUR/MWh")
+            print(f"    Min: {stats['min']:.2f} EUR/MWh")
+            print(f"    Max: {stats['max']:.2f} EUR/MWh")
+            print(f"    Avg: {stats['mean']:.2f} EUR/MWh")
             print(f"    Number of hours: {len(prices)}")
             
             # Sanity checks
-            assert prices.min() >= 0, f"Negative prices found: {prices.min()}"
-            assert prices.max() < 1000, f"Suspiciously high price: {prices.max()}"
+            assert stats['min'] >= 0, f"Negative prices found: {stats['min']}"
+            assert stats['max'] < 1000, f"Suspiciously high price: {stats['max']}"
             
-            # Show hourly prices
+            # Show hourly prices (just the first 6 hours)
             print(f"\n  Hourly prices:")
-            for i, (hour, price) in enumerate(prices.items(), 1):
-                print(f"    Hour {i:2d}: {price:7.2f} EUR/MWh")
-                if i >= 6:  # Just show first 6 hours
-                    print(f"    ... ({len(prices) - 6} more hours)")
-                    break
+            hourly = prices.head(6).to_string(float_format=lambda x: f"{x:7.2f} EUR/MWh")
+            print(textwrap.indent(hourly, '    '))
+            if len(prices) > 6:
+                print(f"    ... ({len(prices) - 6} more hours)")
         
         # Check Portuguese prices too
         portugal_prices = df[df['CONCEPT'] == 'PRICE_PT']
@@ -0,0 +1,106 @@
+"""
+Test loading raw OMIE price files into DuckDB.
+Run: python tests/test_omie_loader.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.db_schema import SCHEMA_SQL
+from src.utils.omie_loader import ingest_omie, summarize_omie
+
+
+def make_omie_file(path, start, days, offset=0.0):
+    """Write a small wide OMIE file: price + energy concepts, H1..H25."""
+    dates = pd.date_range(start, periods=days, freq='D')
+    rows = []
+    for concept, base in [('PRICE_SP', 100), ('PRICE_PT', 200), ('ENER_IB', 9000)]:
+        for day, date in enumerate(dates):
+            hours = {f'H{i}': base + day + (i - 1) / 100 + offset for i in range(1, 25)}
+            hours['H25'] = np.nan
+            rows.append({'DATE': date, 'CONCEPT': concept, **hours})
+    df = pd.DataFrame(rows)
+    df.loc[0, 'H5'] = np.nan  # one missing Spanish hour
+    df.to_parquet(path)
+
+
+def test_ingest_omie():
+    """Test that overlapping files load once, first file winning."""
+
+    print("Testing OMIE ingest...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        make_omie_file(tmp / 'day_ahead_prices_a.parquet', '2022-10-28', 3)
+        make_omie_file(tmp / 'day_ahead_prices_b.parquet', '2022-10-30', 2, offset=0.5)
+
+        conn = duckdb.connect()
+        conn.execute(SCHEMA_SQL)
+
+        rows_per_file, inserted = ingest_omie(conn, (tmp / 'day_ahead_prices_*.parquet').as_posix())
+
+        print(f"  Rows per file: {rows_per_file}")
+        print(f"  Inserted: {inserted}")
+
+        # 2 countries x 24 hours per day, minus the missing H5 in each file
+        assert rows_per_file == {
+            'day_ahead_prices_a.parquet': 3 * 48 - 1,
+            'day_ahead_prices_b.parquet': 2 * 48 - 1,
+        }, "Wrong number of price rows read"
+        # 4 distinct days in total; only the first file's missing hour stays missing
+        assert inserted == 4 * 48 - 1, "Overlapping days were not de-duplicated"
+
+        # Overlapping day keeps the first file's value; H1 is 00:00 UTC
+        overlap = conn.execute("""
+            SELECT price_eur_mwh FROM prices_day_ahead
+            WHERE timestamp = TIMESTAMP '2022-10-30 00:00:00' AND country = 'ES'
+        """).fetchone()[0]
+        assert overlap == 102.0, f"Expected first file's price, got {overlap}"
+
+        # H25 and energy concepts are not loaded
+        countries = conn.execute("SELECT DISTINCT country FROM prices_day_ahead ORDER BY 1").fetchall()
+        assert countries == [('ES',), ('PT',)], f"Unexpected countries: {countries}"
+
+        conn.close()
+
+    print("  ✓ Overlapping files loaded once, first file wins")
+    return True
+
+
+def test_summarize_omie():
+    """Test the per-file summary printed before loading."""
+
+    print("Testing OMIE file summary...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        make_omie_file(tmp / 'day_ahead_prices_a.parquet', '2022-10-28', 3)
+
+        conn = duckdb.connect()
+        summary = summarize_omie(conn, (tmp / 'day_ahead_prices_*.parquet').as_posix())
+        conn.close()
+
+        print(f"  Summary: {summary}")
+
+        # One row per (day, concept); price rows are counted per country
+        assert summary == {
+            'day_ahead_prices_a.parquet': {
+                'raw_rows': 9,
+                'concepts': ['ENER_IB', 'PRICE_PT', 'PRICE_SP'],
+                'price_rows': {'ES': 3, 'PT': 3},
+            },
+        }, "Wrong file summary"
+
+    print("  ✓ Raw rows, concepts and price rows per country reported")
+    return True
+
+
+if __name__ == "__main__":
+    test_ingest_omie()
+    test_summarize_omie()
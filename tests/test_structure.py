@@ -3,8 +3,25 @@ Quick test to validate project structure.
 Run: python tests/test_structure.py
 """
 
+import os
 from pathlib import Path
 
+
+def list_dirs(paths):
+    """Map each parent of `paths` to {entry name: is_dir}, one os.scandir per parent."""
+    listings = {}
+    for path in paths:
+        parent = Path(path).parent
+        if parent in listings:
+            continue
+        try:
+            with os.scandir(parent) as entries:
+                listings[parent] = {entry.name: entry.is_dir() for entry in entries}
+        except FileNotFoundError:
+            listings[parent] = {}
+    return listings
+
+
 def test_structure():
     """Check that all required directories exist."""
     
@@ -28,11 +45,12 @@ def test_structure():
     print("Testing project structure...")
     
     all_good = True
+    listings = list_dirs(required_dirs + required_files)
     
     # Check directories
     for dir_path in required_dirs:
         path = Path(dir_path)
-        if path.exists():
+        if listings[path.parent].get(path.name) is True:
             print(f"  ✓ {dir_path}")
         else:
             print(f"  ✗ {dir_path} - MISSING!")
@@ -41,7 +59,7 @@ def test_structure():
     # Check files
     for file_path in required_files:
         path = Path(file_path)
-        if path.exists():
+        if listings[path.parent].get(path.name) is False:
             print(f"  ✓ {file_path}")
         else:
             print(f"  ✗ {file_path} - MISSING!")
@@ -5,8 +5,8 @@ Run: python tests/test_timezone_utils.py
 
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
-import pytz
 
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -39,7 +39,7 @@ def test_normalize_to_utc():
     
     # CET is UTC+2 in summer, so 12:00 CET = 10:00 UTC
     assert df_utc['timestamp'].iloc[0].hour == 10, "CET to UTC conversion failed"
-    assert df_utc['timestamp'].iloc[0].tz == pytz.UTC, "Not in UTC timezone"
+    assert str(df_utc['timestamp'].dt.tz) == 'UTC', "Not in UTC timezone"
     
     print("  ✓ CET to UTC works correctly")
     
@@ -64,7 +64,7 @@ def test_normalize_to_utc():
     
     df_result = normalize_to_utc(df_naive)
     
-    assert df_result['timestamp'].iloc[0].tz == pytz.UTC, "Naive timestamps not converted to UTC"
+    assert str(df_result['timestamp'].dt.tz) == 'UTC', "Naive timestamps not converted to UTC"
     print("  ✓ Naive timestamps handled (assumed UTC)")
     
     print("\n✅ TEST 1 PASSED: normalize_to_utc works correctly\n")
@@ -94,10 +94,13 @@ def test_create_hour_index():
     
     # Test 2b: No gaps
     print("\n2b. Checking for gaps...")
-    time_diffs = hour_index['timestamp'].diff()
-    gaps = time_diffs[time_diffs > pd.Timedelta(hours=1)]
+    # Consecutive differences on the raw datetime64 array (compared as
+    # timedelta64, so the check holds whatever unit the column is stored in)
+    time_diffs = np.diff(hour_index['timestamp'].values)
+    one_hour = np.timedelta64(1, 'h')
+    gaps = time_diffs[time_diffs > one_hour]
     
-    if gaps.empty:
+    if gaps.size == 0:
         print("  ✓ No gaps in hourly sequence")
     else:
         print(f"  ✗ Found {len(gaps)} gaps!")
@@ -105,14 +108,13 @@ def test_create_hour_index():
     
     # Test 2c: All in UTC
     print("\n2c. Checking timezone...")
-    assert hour_index['timestamp'].iloc[0].tz == pytz.UTC, "Timestamps not in UTC"
+    assert str(hour_index['timestamp'].dt.tz) == 'UTC', "Timestamps not in UTC"
     print("  ✓ All timestamps in UTC")
     
     # Test 2d: Exactly hourly
     print("\n2d. Checking hourly frequency...")
-    # All differences (except first NaT) should be exactly 1 hour
-    diffs = time_diffs.dropna()
-    assert all(diffs == pd.Timedelta(hours=1)), "Not all intervals are exactly 1 hour"
+    # All differences should be exactly 1 hour
+    assert (time_diffs == one_hour).all(), "Not all intervals are exactly 1 hour"
     print("  ✓ All intervals exactly 1 hour")
     
     print("\n✅ TEST 2 PASSED: create_hour_index works correctly\n")
@@ -167,18 +169,19 @@ def test_add_time_features():
     # June 15, 2022 was a Wednesday (not weekend)
     # June 18, 2022 was a Saturday (weekend)
 
-    # Find Wednesday and Saturday in our data
-    df_june = df_with_features[df_with_features['timestamp'].dt.month == 6]
-    wednesday_rows = df_june[df_june['timestamp'].dt.day == 15]
-    saturday_rows = df_june[df_june['timestamp'].dt.day == 18]
+    # Find Wednesday and Saturday in our data (one datetime64 array, UTC dates)
+    days = df_with_features['timestamp'].values.astype('datetime64[D]')
+    is_weekend = df_with_features['is_weekend'].to_numpy()
+    wednesday_rows = is_weekend[days == np.datetime64('2022-06-15')]
+    saturday_rows = is_weekend[days == np.datetime64('2022-06-18')]
 
     if len(wednesday_rows) > 0:
-        wednesday = wednesday_rows['is_weekend'].iloc[0]
+        wednesday = wednesday_rows[0]
         assert wednesday == False, "Wednesday incorrectly marked as weekend"
         print(f"  ✓ Wednesday correctly marked as not weekend")
 
     if len(saturday_rows) > 0:
-        saturday = saturday_rows['is_weekend'].iloc[0]
+        saturday = saturday_rows[0]
         assert saturday == True, "Saturday not marked as weekend"
         print(f"  ✓ Saturday correctly marked as weekend")
     else:
@@ -219,10 +222,10 @@ def test_handle_dst_transitions():
     # Test 4b: Duplicate timestamps
     print("\n4b. Testing duplicate timestamp handling...")
     df_duplicates = pd.DataFrame({
-        'timestamp': ['2022-06-15 01:00', '2022-06-15 02:00', '2022-06-15 02:00', '2022-06-15 03:00'],
+        'timestamp': pd.DatetimeIndex(np.array(['2022-06-15T01:00', '2022-06-15T02:00', '2022-06-15T02:00', '2022-06-15T03:00'],
+                                               dtype='datetime64[ns]'), tz='UTC'),
         'value': [1, 2, 3, 4]
     })
-    df_duplicates['timestamp'] = pd.to_datetime(df_duplicates['timestamp'], utc=True)
     
     df_result = handle_dst_transitions(df_duplicates)
     
@@ -233,10 +236,10 @@ def test_handle_dst_transitions():
     # Test 4c: Data with gaps
     print("\n4c. Testing gap detection...")
     df_gap = pd.DataFrame({
-        'timestamp': ['2022-06-15 01:00', '2022-06-15 02:00', '2022-06-15 05:00'],  # 3-hour gap!
+        'timestamp': pd.DatetimeIndex(np.array(['2022-06-15T01:00', '2022-06-15T02:00', '2022-06-15T05:00'],  # 3-hour gap!
+                                               dtype='datetime64[ns]'), tz='UTC'),
         'value': [1, 2, 3]
     })
-    df_gap['timestamp'] = pd.to_datetime(df_gap['timestamp'], utc=True)
     
     df_result = handle_dst_transitions(df_gap)
     
@@ -30,7 +30,7 @@ def test_weather_download():
         print(f"  ✓ Downloaded {len(df)} hourly records")
         print(f"  ✓ Columns: {list(df.columns)}")
         print(f"\nSample data:")
-        print(df.head())
+        print(df.head().to_csv(index=False), end="")
         
         # Check we have expected columns
         expected_cols = ['temperature_c', 'wind_speed_100m', 'solar_radiation']